@@ -50,13 +50,14 @@ import os
 import shutil
 import sys
 import warnings
+from concurrent.futures import as_completed, ThreadPoolExecutor
 from os.path import expandvars
 from pathlib import Path
+from stat import S_ISDIR, S_ISREG
 from subprocess import CalledProcessError
+from urllib.parse import unquote, urlencode, urljoin
 from urllib.request import urlopen
-from urllib.parse import parse_qs, unquote, urlencode, urljoin, urlparse
 
-import ipykernel
 from IPython.display import clear_output
 from IPython.terminal.interactiveshell import TerminalInteractiveShell
 
@@ -85,6 +86,15 @@ SITE_PACKAGES_SUFFIX = PATHSEP.join((
     f'python{sys.version_info.major}.{sys.version_info.minor}',
     'site-packages'
 ))
+# string form of DAVOS_PROJECT_DIR with trailing separator, so project
+# directory paths can be built without repeated `Path.joinpath()` calls
+_PROJECT_DIR_PREFIX = f'{DAVOS_PROJECT_DIR}{PATHSEP}'
+# project directories for which `cleanup_project_dir_atexit` has already
+# been registered
+_ATEXIT_REGISTERED_DIRS = set()
+# paths to notebooks found by `get_notebook_path()` in Jupyter, keyed by
+# kernel ID
+_NOTEBOOK_PATHS = {}
 
 
 class ProjectChecker(type):
@@ -106,6 +116,17 @@ class Project(metaclass=ProjectChecker):
     A pseudo-environment associated with a particular (set of)
     davos-enhanced notebook(s).
     """
+    __slots__ = (
+        'name',
+        'safe_name',
+        'project_dir',
+        'site_packages_dir',
+        '_site_packages_mtime',
+        '_installed_packages',
+        # keep instances weak-referenceable, as they were before
+        # `__slots__` was added
+        '__weakref__'
+    )
 
     def __init__(self, name):
         """
@@ -132,12 +153,17 @@ class Project(metaclass=ProjectChecker):
         """
         self.name = name
         self.safe_name = _filepath_to_safename(name)
-        self.project_dir = DAVOS_PROJECT_DIR.joinpath(self.safe_name)
-        self.site_packages_dir = self.project_dir.joinpath(SITE_PACKAGES_SUFFIX)
+        self.project_dir = Path(f'{_PROJECT_DIR_PREFIX}{self.safe_name}')
+        self.site_packages_dir = Path(
+            f'{_PROJECT_DIR_PREFIX}{self.safe_name}{PATHSEP}{SITE_PACKAGES_SUFFIX}'
+        )
         # eagerly create project dir since it's low-cost
         self.project_dir.mkdir(parents=False, exist_ok=True)
-        # register atexit hook to remove project dir if empty
-        atexit.register(cleanup_project_dir_atexit, self.project_dir)
+        # register atexit hook to remove project dir if empty (only once
+        # per directory, no matter how many Projects are created for it)
+        if self.project_dir not in _ATEXIT_REGISTERED_DIRS:
+            atexit.register(cleanup_project_dir_atexit, self.project_dir)
+            _ATEXIT_REGISTERED_DIRS.add(self.project_dir)
         # last modified time of self.site_packages_dir
         self._site_packages_mtime = -1
         # cache of installed packages as of self._site_packages_mtime
@@ -265,9 +291,12 @@ class Project(metaclass=ProjectChecker):
             if not confirmed and not config.suppress_stdout:
                 print(f"{self.name} not removed")
                 return
-        shutil.rmtree(self.project_dir)
         if self == config._project:
-            self.project_dir.mkdir()
+            # leave the (now empty) directory in place rather than
+            # removing and immediately re-creating it
+            _clear_dir(self.project_dir)
+        else:
+            shutil.rmtree(self.project_dir)
 
     def rename(self, new_name):
         """
@@ -311,7 +340,7 @@ class Project(metaclass=ProjectChecker):
             # no change
             return
         new_safe_name = _filepath_to_safename(new_project_name)
-        new_project_dir = DAVOS_PROJECT_DIR.joinpath(new_safe_name)
+        new_project_dir = Path(f'{_PROJECT_DIR_PREFIX}{new_safe_name}')
         if new_project_dir.is_dir() and not _dir_is_empty(new_project_dir):
             # new project dir exists and is non-empty
             raise DavosProjectError(
@@ -333,7 +362,9 @@ class Project(metaclass=ProjectChecker):
         # since we already know the Project's new type
         template_instance = type.__call__(new_project_type, new_project_name)
         self.__class__ = template_instance.__class__
-        self.__dict__ = template_instance.__dict__
+        for attr in Project.__slots__:
+            if attr != '__weakref__':
+                setattr(self, attr, getattr(template_instance, attr))
         self._installed_packages = old_installed_pkgs
         self._site_packages_mtime = old_site_pkgs_mtime
         # explicitly delete the temporary new Project instance so its
@@ -364,9 +395,10 @@ class AbstractProject(Project):
     renamed/moved notebook to continue using it to manage smuggled
     packages.
     """
+    __slots__ = ()
 
     def __getattr__(self, item):
-        if hasattr(ConcreteProject, item):
+        if item in _CONCRETE_PROJECT_ATTRS:
             msg = f"{item!r} is not supported for abstract projects"
         else:
             msg = f"{self.__class__.__name__!r} object has no attribute {item!r}"
@@ -396,6 +428,32 @@ class ConcreteProject(Project):
     with the parent class since instances of it are never actually
     created due the behavior of the `ProjectChecker` metaclass.
     """
+    __slots__ = ()
+
+
+# names of all attributes available on `ConcreteProject`s, precomputed
+# so `AbstractProject.__getattr__` can check them with a set lookup
+_CONCRETE_PROJECT_ATTRS = frozenset(dir(ConcreteProject))
+
+
+def _clear_dir(path):
+    """
+    Remove the contents of a directory, but not the directory itself.
+
+    Uses `os.scandir()` so entry types can be checked without an
+    additional `stat` call per entry.
+
+    Parameters
+    ----------
+    path : pathlib.Path
+        The path to the directory to clear.
+    """
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                shutil.rmtree(entry.path)
+            else:
+                os.unlink(entry.path)
 
 
 def _dir_is_empty(path):
@@ -438,7 +496,75 @@ def _filepath_to_safename(filepath):
     str
         The filepath in "safe" format.
     """
-    return filepath.replace(PATHSEP, PATHSEP_REPLACEMENT).replace('.ipynb', '')
+    if filepath.endswith('.ipynb'):
+        # slice rather than `str.removesuffix()` for Python<3.9 support
+        filepath = filepath[:-6]
+    return filepath.replace(PATHSEP, PATHSEP_REPLACEMENT)
+
+
+def _find_notebook_path(kernel_id):
+    """
+    Find the path to the notebook running on the given kernel.
+
+    Uncached helper for `get_notebook_path()` that queries each running
+    Jupyter server's sessions API (concurrently, if there are multiple
+    servers) for the notebook associated with `kernel_id`.
+
+    Parameters
+    ----------
+    kernel_id : str
+        The ID of the kernel running the notebook.
+
+    Returns
+    -------
+    str
+        The absolute path (Jupyter) or name (Colab) of the notebook.
+    """
+    # map each server's sessions API URL to its root directory, so each
+    # server is queried only once
+    api_url_root_dirs = {}
+    for nbserver_url, token, nbserver_root_dir in _get_running_servers():
+        notebook_api_url = urljoin(nbserver_url, '/api/sessions')
+        if token:
+            notebook_api_url = f'{notebook_api_url}?{urlencode({"token": token})}'
+        api_url_root_dirs[notebook_api_url] = nbserver_root_dir
+
+    if len(api_url_root_dirs) == 1:
+        # most common case -- no need for a thread pool
+        (api_url, root_dir), = api_url_root_dirs.items()
+        notebook_path = _query_server_for_kernel(api_url, root_dir, kernel_id)
+        if notebook_path is not None:
+            return notebook_path
+    elif api_url_root_dirs:
+        # query all servers concurrently and use the first one that
+        # finds the kernel's session
+        executor = ThreadPoolExecutor(max_workers=len(api_url_root_dirs))
+        try:
+            futures = [
+                executor.submit(_query_server_for_kernel, api_url, root_dir, kernel_id)
+                for api_url, root_dir in api_url_root_dirs.items()
+            ]
+            for future in as_completed(futures):
+                notebook_path = future.result()
+                if notebook_path is not None:
+                    return notebook_path
+        finally:
+            # don't wait on requests to other servers once a match is
+            # found. Each request uses its own connection, so these
+            # can safely finish in the background
+            executor.shutdown(wait=False)
+
+    # VS Code doesn't actually start a Jupyter server when connecting to
+    # kernels, so the Jupyter API won't work. Fortunately, it's easy to
+    # check if the notebook is being run through VS Code, and to get its
+    # absolute path, if so.
+    # environment variable defined only if running in VS Code
+    if os.getenv('VSCODE_PID') is not None:
+        # global variable that holds absolute path to notebook file
+        return config.ipython_shell.user_ns['__vsc_ipynb_file__']
+
+    # shouldn't ever get here, but just in case
+    raise RuntimeError("Could not find notebook path for current kernel")
 
 
 def _get_project_name_type(project_name):
@@ -518,13 +644,20 @@ def _get_project_name_type(project_name):
                 "notebook file. Notebook file names must contain at least one "
                 "character."
             )
-        if nb_path.is_dir():
+        # stat the path once rather than calling both `.is_dir()` and
+        # `.is_file()`
+        try:
+            nb_path_mode = os.stat(nb_path).st_mode
+        except OSError:
+            # path doesn't exist (or can't be accessed)
+            nb_path_mode = 0
+        if S_ISDIR(nb_path_mode):
             raise DavosProjectError(
                 f"Invalid project name: {project_name!r}. Project names ending"
                 "in '.ipynb' must point to Jupyter notebook files. "
                 f"'{nb_path}' is a directory."
             )
-        if not nb_path.is_file():
+        if not S_ISREG(nb_path_mode):
             project_type = AbstractProject
         project_name = str(nb_path)
     elif PATHSEP in project_name or project_name in ('.', '..'):
@@ -559,6 +692,177 @@ def _get_project_name_type(project_name):
     return project_name, project_type
 
 
+def _get_running_servers():
+    """
+    Get connection info for the currently running Jupyter servers.
+
+    Reads the server info files each running Jupyter server writes to
+    the Jupyter runtime directory. This is the same information
+    `jupyter notebook list`/`jupyter lab list` display (including
+    skipping files whose server process is no longer running), but
+    reading it directly avoids spawning a separate Python process to do
+    so. If no server info files are found (or `jupyter_core` isn't
+    available), falls back to parsing the output of the appropriate
+    shell command.
+
+    Returns
+    -------
+    list of tuple of str
+        A (url, token, root_dir) tuple for each running server. `token`
+        is an empty string if the server doesn't require one.
+
+    Raises
+    ------
+    RuntimeError
+        If the shell command used as a fallback fails.
+    """
+    servers = []
+    try:
+        from jupyter_core.paths import jupyter_runtime_dir
+    except ImportError:
+        pass
+    else:
+        # "nbserver-<pid>.json" for `notebook<7`, "jpserver-<pid>.json"
+        # for `jupyter_server`-based interfaces
+        for server_file in Path(jupyter_runtime_dir()).glob('*server-*.json'):
+            try:
+                with server_file.open() as f:
+                    server_info = json.load(f)
+            except (OSError, ValueError):
+                # file was removed or is still being written
+                continue
+            if (
+                    'url' not in server_info or
+                    not _pid_is_running(server_info.get('pid'))
+            ):
+                # file is malformed, or was left behind by a server that
+                # didn't shut down cleanly. `jupyter {notebook,lab} list`
+                # skips the latter too
+                continue
+            root_dir = server_info.get('root_dir', server_info.get('notebook_dir', ''))
+            servers.append((server_info['url'],
+                            server_info.get('token', ''),
+                            root_dir.rstrip('/')))
+
+    if servers:
+        return servers
+
+    nbserver_list_cmd = f'jupyter {config._jupyter_interface} list'
+    try:
+        running_nbservers_stdout = run_shell_command(nbserver_list_cmd,
+                                                     live_stdout=False)
+    except CalledProcessError as e:
+        # raise RuntimeError so it's caught by `use_default_project` and
+        # the fallback project is used
+        raise RuntimeError(
+            "Shell command to get running Jupyter servers "
+            f"({nbserver_list_cmd}) failed"
+        ) from e
+
+    for line in running_nbservers_stdout.splitlines():
+        # should only need to exclude first line ("Currently running
+        # servers:"), but handle safely in case output format changes in
+        # the future
+        if not line.strip().startswith('http'):
+            continue
+
+        nbserver_url, nbserver_root_dir = line.split('::')
+        nbserver_url = nbserver_url.strip()
+        nbserver_root_dir = nbserver_root_dir.strip().rstrip('/')
+
+        # server URLs are listed as "<url>?token=<token>" if the server
+        # requires a token. Split it out directly rather than fully
+        # parsing the URL & query string
+        nbserver_url, _, token = nbserver_url.partition('?token=')
+        # get just the NotebookApp token in case there are multiple parts
+        token = token.partition('&')[0]
+        servers.append((nbserver_url, token, nbserver_root_dir))
+
+    return servers
+
+
+def _pid_is_running(pid):
+    """
+    Check whether a process with the given PID is running.
+
+    Mirrors the check `jupyter notebook list`/`jupyter lab list` use to
+    filter out server info files left behind by servers that are no
+    longer running.
+
+    Parameters
+    ----------
+    pid : int or None
+        The process ID to check. If `None` (e.g., the server info file
+        doesn't record one), the process is assumed to be running.
+
+    Returns
+    -------
+    bool
+        Whether the process is (assumed to be) running.
+    """
+    if pid is None or os.name == 'nt':
+        # on Windows, `os.kill()` terminates the process rather than
+        # just checking for it, so don't filter anything out
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # process exists but is owned by another user
+        return True
+    return True
+
+
+def _query_server_for_kernel(api_url, root_dir, kernel_id):
+    """
+    Look for a kernel's notebook among a Jupyter server's sessions.
+
+    Parameters
+    ----------
+    api_url : str
+        The full URL for the server's sessions API endpoint, including
+        the token query parameter, if needed.
+    root_dir : str
+        The server's root directory.
+    kernel_id : str
+        The ID of the kernel running the notebook.
+
+    Returns
+    -------
+    str or None
+        The absolute path (Jupyter) or name (Colab) of the notebook, or
+        `None` if the server couldn't be reached or isn't running the
+        kernel.
+    """
+    try:
+        with urlopen(api_url, timeout=10) as response:
+            response_data = response.read().decode('utf-8')
+    except OSError:
+        # server info files can be left behind in the Jupyter runtime
+        # directory by servers that didn't shut down cleanly, so skip
+        # any server that can't be reached
+        return None
+
+    response_json = json.loads(response_data)
+    # single pass over the server's sessions that stops at the first
+    # (only) one running on the kernel
+    session = next(
+        (s for s in response_json if s['kernel']['id'] == kernel_id),
+        None
+    )
+    if session is None:
+        return None
+
+    if config.environment == 'Colaboratory':
+        # Colab notebooks don't actually live on Colab VM filesystem, so
+        # just use notebook name
+        return unquote(session['notebook']['name'])
+
+    notebook_relpath = unquote(session['notebook']['path'])
+    return f'{root_dir}/{notebook_relpath}'
+
+
 def _safename_to_filepath(safename):
     """
     Convert a project name in "safe" format to a filepath.
@@ -599,9 +903,10 @@ def cleanup_project_dir_atexit(dirpath):
     so any Project whose repr is displayed in the notebook also won't
     have its reference count drop to zero before shutdown.
 
-    As a backup, each Project instance registers a call to this function
-    with `atexit.register()`, so any empty project dirs that still exist
-    at shutdown will be caught and removed. This function is defined
+    As a backup, the first Project instance created for each project
+    directory registers a call to this function with
+    `atexit.register()`, so any empty project dirs that still exist at
+    shutdown will be caught and removed. This function is defined
     outside the Project class so the atexit registry doesn't store a
     reference to the instance unnecessarily for the whole session.
 
@@ -610,21 +915,24 @@ def cleanup_project_dir_atexit(dirpath):
     dirpath : pathlib.Path
         The path to the project directory to be removed.
     """
-    if dirpath.is_dir() and _dir_is_empty(dirpath):
-        try:
-            dirpath.rmdir()
-        except OSError as e:
-            if e.errno == errno.ENOTEMPTY:
-                # dirpath is empty except for a .DS_Store file
-                try:
-                    dirpath.joinpath('.DS_Store').unlink()
-                except FileNotFoundError:
-                    # shouldn't be possible to get here, but silently
-                    # handle errors just in case so we don't interfere
-                    # with shutdown
-                    pass
-                else:
-                    dirpath.rmdir()
+    # just try to remove the directory and let the OS check whether it
+    # exists and is empty, rather than checking both beforehand
+    try:
+        dirpath.rmdir()
+    except OSError as e:
+        # dirpath either doesn't exist (nothing to do), contains
+        # packages (leave it in place), or is empty except for a
+        # .DS_Store file
+        if e.errno == errno.ENOTEMPTY and _dir_is_empty(dirpath):
+            try:
+                dirpath.joinpath('.DS_Store').unlink()
+            except FileNotFoundError:
+                # shouldn't be possible to get here, but silently
+                # handle errors just in case so we don't interfere with
+                # shutdown
+                pass
+            else:
+                dirpath.rmdir()
 
 
 def get_notebook_path():
@@ -638,69 +946,47 @@ def get_notebook_path():
     name of the notebook since Colab notebooks don't actually exist on
     the Colab VM filesystem.
 
+    In Jupyter, the result is cached for the current kernel, so
+    subsequent calls don't need to query the running Jupyter servers
+    again unless the notebook has since been moved, renamed, or deleted.
+    Note that a copy made with "Save As" that keeps the same kernel
+    will report the original notebook's path for as long as that file
+    exists. In Colab, the server is always queried, since notebooks
+    don't exist on the VM filesystem and there's no cheap way to tell
+    whether a cached name is still current.
+
     Returns
     -------
     str
         The absolute path (Jupyter) or name (Colab) of the current
     """
-    kernel_filepath = ipykernel.connect.get_connection_file()
-    kernel_id = kernel_filepath.split('/kernel-')[-1].split('.json')[0]
-
-    nbserver_list_cmd = f'jupyter {config._jupyter_interface} list'
-    try:
-        running_nbservers_stdout = run_shell_command(nbserver_list_cmd,
-                                                     live_stdout=False)
-    except CalledProcessError as e:
-        # raise RuntimeError so it's caught by `use_default_project` and
-        # the fallback project is used
-        raise RuntimeError(
-            "Shell command to get running Jupyter servers "
-            f"({nbserver_list_cmd}) failed"
-        ) from e
-
-    for line in running_nbservers_stdout.splitlines():
-        # should only need to exclude first line ("Currently running
-        # servers:"), but handle safely in case output format changes in
-        # the future
-        if not line.strip().startswith('http'):
-            continue
-
-        nbserver_url, nbserver_root_dir = line.split('::')
-        nbserver_url = nbserver_url.strip()
-        nbserver_root_dir = nbserver_root_dir.strip().rstrip('/')
-
-        notebook_api_url = urljoin(nbserver_url, '/api/sessions')
-        parsed_url = urlparse(nbserver_url)
-        if parsed_url.query:
-            # get just the NotebookApp token in case there are multiple parts
-            token_param = {'token': parse_qs(parsed_url.query)['token'][0]}
-            notebook_api_url = f'{notebook_api_url}?{urlencode(token_param)}'
-
-        with urlopen(notebook_api_url, timeout=10) as response:
-            response_data = response.read().decode('utf-8')
+    # imported here rather than at module level since it's only needed
+    # to find the default project for notebooks, and `ipykernel` (plus
+    # its dependencies) is slow to import if it isn't already loaded
+    from ipykernel.connect import get_connection_file
 
-        response_json = json.loads(response_data)
-        for session in response_json:
-            if session['kernel']['id'] == kernel_id:
-                if config.environment == 'Colaboratory':
-                    # Colab notebooks don't actually live on Colab VM
-                    # filesystem, so just use notebook name
-                    return unquote(session['notebook']['name'])
+    kernel_filepath = get_connection_file()
+    kernel_id = kernel_filepath.split('/kernel-')[-1].split('.json')[0]
 
-                notebook_relpath = unquote(session['notebook']['path'])
-                return f'{nbserver_root_dir}/{notebook_relpath}'
+    if config.environment == 'Colaboratory':
+        # a Colab notebook can be renamed without restarting its kernel,
+        # and a stale name would make its project an AbstractProject
+        return _find_notebook_path(kernel_id)
 
-    # VS Code doesn't actually start a Jupyter server when connecting to
-    # kernels, so the Jupyter API won't work. Fortunately, it's easy to
-    # check if the notebook is being run through VS Code, and to get its
-    # absolute path, if so.
-    # environment variable defined only if running in VS Code
-    if os.getenv('VSCODE_PID') is not None:
-        # global variable that holds absolute path to notebook file
-        return config.ipython_shell.user_ns['__vsc_ipynb_file__']
+    try:
+        notebook_path = _NOTEBOOK_PATHS[kernel_id]
+    except KeyError:
+        pass
+    else:
+        # if the notebook was moved or renamed while the kernel was
+        # running, the cached path will no longer exist and needs to be
+        # looked up again
+        if os.path.isfile(notebook_path):
+            return notebook_path
 
-    # shouldn't ever get here, but just in case
-    raise RuntimeError("Could not find notebook path for current kernel")
+    notebook_path = _find_notebook_path(kernel_id)
+    _NOTEBOOK_PATHS[kernel_id] = notebook_path
+    return notebook_path
 
 
 def get_project(project_name, create=False):
@@ -743,7 +1029,7 @@ def get_project(project_name, create=False):
     # callbacks unnecessarily
     cleaned_name, project_cls = _get_project_name_type(project_name)
     safe_name = _filepath_to_safename(cleaned_name)
-    project_dir = DAVOS_PROJECT_DIR.joinpath(safe_name)
+    project_dir = Path(f'{_PROJECT_DIR_PREFIX}{safe_name}')
     if project_dir.is_dir():
         # since we already got the project's name and type above, we can
         # call `type.__call__` directly and bypass the `ProjectChecker`
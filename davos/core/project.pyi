@@ -10,6 +10,9 @@ DAVOS_PROJECT_DIR: Final[PosixPath]
 PATHSEP: Final[Literal['/', '\\']]
 PATHSEP_REPLACEMENT: Final[Literal['___']]
 SITE_PACKAGES_SUFFIX: Final[str]
+_PROJECT_DIR_PREFIX: Final[str]
+_ATEXIT_REGISTERED_DIRS: set[PosixPath]
+_NOTEBOOK_PATHS: dict[str, str]
 
 _P = TypeVar('_P', bound=Project)
 _InstalledPkgs = list[tuple[str, str]]
@@ -18,6 +21,7 @@ class ProjectChecker(type):
     def __call__(cls, name: PosixPath | str) -> AbstractProject | ConcreteProject: ...
 
 class Project(metaclass=ProjectChecker):
+    __slots__: tuple[str, ...]
     _installed_packages: _InstalledPkgs
     _site_packages_mtime: float
     name: str
@@ -48,9 +52,16 @@ class AbstractProject(Project):
 
 class ConcreteProject(Project): ...
 
+_CONCRETE_PROJECT_ATTRS: Final[frozenset[str]]
+
+def _clear_dir(path: PosixPath) -> None: ...
 def _dir_is_empty(path: PosixPath) -> bool: ...
 def _filepath_to_safename(filepath: str) -> str: ...
+def _find_notebook_path(kernel_id: str) -> str: ...
 def _get_project_name_type(project_name: PosixPath | str) -> tuple[str, AbstractProject | ConcreteProject]: ...
+def _get_running_servers() -> list[tuple[str, str, str]]: ...
+def _pid_is_running(pid: int | None) -> bool: ...
+def _query_server_for_kernel(api_url: str, root_dir: str, kernel_id: str) -> str | None: ...
 def _safename_to_filepath(safename: str) -> str: ...
 def cleanup_project_dir_atexit(dirpath: PosixPath) -> None: ...
 def get_notebook_path() ->  str: ...
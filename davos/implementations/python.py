@@ -17,6 +17,7 @@ import locale
 import shlex
 import signal
 import sys
+import threading
 from contextlib import redirect_stdout
 from io import StringIO
 from subprocess import CalledProcessError, PIPE, Popen
@@ -113,9 +114,10 @@ def _run_shell_command_helper(command):
     Run a shell command in a subprocess, piping stdout & stderr.
 
     Pure Python implementation of helper function for
-    `davos.core.core.run_shell_command`. stdout & stderr streams are
-    captured or suppressed by the outer function. If the command runs
-    successfully, return its exit status (`0`). Otherwise, raise an
+    `davos.core.core.run_shell_command`. The command's stdout is written
+    to `sys.stdout`, where it's captured or suppressed by the outer
+    function. Its stderr is forwarded to `sys.stderr` separately, as
+    it's produced. If the command exits with a non-zero status, raise an
     error.
 
     Parameters
@@ -123,12 +125,6 @@ def _run_shell_command_helper(command):
     command : str
         The command to execute.
 
-    Returns
-    -------
-    int
-        The exit code of the command. This will always be `0` if the
-        function returns. Otherwise, an error is raised.
-
     Raises
     ------
     subprocess.CalledProcessError :
@@ -139,20 +135,34 @@ def _run_shell_command_helper(command):
                     stdout=PIPE,
                     stderr=PIPE,
                     encoding=locale.getpreferredencoding())
-    try:
-        while True:
-            retcode = process.poll()
-            if retcode is None:
-                output = process.stdout.readline()
-                if output:
-                    sys.stdout.write(output)
-            elif retcode != 0:
-                # processed returned with non-zero exit status
-                raise CalledProcessError(returncode=retcode, cmd=cmd)
-    except KeyboardInterrupt:
-        # forward CTRL + C to process before raising
-        process.send_signal(signal.SIGINT)
-        raise
+    # forward stderr from a separate thread so it stays separate from
+    # the (potentially parsed) stdout but can't fill its pipe and block
+    # the process
+    stderr_thread = threading.Thread(target=sys.stderr.writelines,
+                                     args=(process.stderr,),
+                                     daemon=True)
+    stderr_thread.start()
+    with process:
+        try:
+            # blocks until each line is available, so no need to poll.
+            # Exits once the process closes its end of the pipe
+            for line in process.stdout:
+                sys.stdout.write(line)
+        except KeyboardInterrupt:
+            # forward CTRL + C to process before raising. Wait for it to
+            # exit and for the stderr thread to finish so the pipe isn't
+            # closed (on exiting the `with` block) while it's being read
+            process.send_signal(signal.SIGINT)
+            process.stdout.close()
+            process.wait()
+            stderr_thread.join()
+            raise
+        stderr_thread.join()
+        retcode = process.wait()
+
+    if retcode != 0:
+        # processed returned with non-zero exit status
+        raise CalledProcessError(returncode=retcode, cmd=cmd)
 
 
 # noinspection PyUnusedLocal